@@ -5,13 +5,13 @@ Requirements:
 - streamlit
 - google-generativeai
 - pandas
-- plotly
 - pillow
+- pydantic
 - python-dotenv
 - PyPDF2 (optional, for PDF support)
 
 Installation:
-pip install streamlit google-generativeai pandas plotly pillow python-dotenv PyPDF2
+pip install streamlit google-generativeai pandas pillow pydantic python-dotenv PyPDF2
 
 Environment Setup:
 Create a .env file with: GOOGLE_API_KEY=your_api_key_here
@@ -20,13 +20,16 @@ OR use Streamlit secrets: Add to .streamlit/secrets.toml
 
 import streamlit as st
 import google.generativeai as genai
-import pandas as pd
-import plotly.express as px
-import json
+# pandas is imported lazily inside the Dashboard code paths,
+# so sessions that never open the Dashboard skip its import cost
 import os
-from PIL import Image
+import hashlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
 import io
 from dotenv import load_dotenv
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 # Load environment variables
 load_dotenv()
@@ -55,6 +58,18 @@ if 'total_questions' not in st.session_state:
     st.session_state.total_questions = 0
 if 'correct_answers' not in st.session_state:
     st.session_state.correct_answers = 0
+if 'question_buffer' not in st.session_state:
+    st.session_state.question_buffer = {}  # (topic, difficulty) -> list of pre-generated questions
+if 'topic_counter' not in st.session_state:
+    st.session_state.topic_counter = Counter()  # topic -> questions generated, kept in step with quiz_history
+if 'history_df' not in st.session_state:
+    st.session_state.history_df = None  # Recent history table, rebuilt only when quiz_history grows
+    st.session_state.history_df_len = 0
+if 'prefetch_futures' not in st.session_state:
+    st.session_state.prefetch_futures = {}  # (topic, difficulty) -> Future for the next question batch
+
+# Number of quiz questions requested from Gemini per API call
+QUIZ_BATCH_SIZE = 5
 
 # Configure Gemini API
 def configure_gemini():
@@ -101,70 +116,151 @@ GOOGLE_API_KEY=your_api_key_here
 # Configure API on app load
 configure_gemini()
 
-# Gemini Helper Functions
-def generate_quiz_question(topic, difficulty="Medium"):
+@st.cache_resource
+def get_model():
     """
-    Generate a PSLE Science MCQ question using Gemini
-    Returns a dictionary with question, options, correct_answer, and explanation
+    Return the shared Gemini model used by all helpers.
+    Cached as a global resource so it is built once per process, not on every call.
     """
-    try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        prompt = f"""You are a PSLE Science tutor creating a multiple-choice question for Singapore Primary School students.
+    return genai.GenerativeModel('gemini-2.5-flash')
+
+@st.cache_resource
+def get_prefetch_executor():
+    """
+    Return the shared thread pool used to prefetch quiz questions in the background.
+    """
+    return ThreadPoolExecutor(max_workers=4)
+
+# Worksheet images are downscaled and re-encoded before being sent to Gemini
+WORKSHEET_MAX_EDGE = 1600
+WORKSHEET_JPEG_QUALITY = 85
+
+# Worksheet caches are shared by all sessions, so bound their size and lifetime
+WORKSHEET_CACHE_MAX_ENTRIES = 32
+WORKSHEET_CACHE_TTL = 3600  # seconds
+
+# Gemini Response Models
+class Question(BaseModel):
+    question: str
+    options: dict[str, str]
+    correct_answer: str
+    explanation: str
+
+class Feedback(BaseModel):
+    transcription: str = ""
+    score: str
+    verdict: str
+    missing_keywords: list[str] = []
+    feedback_text: str = ""
+    model_answer: str = ""
+
+# Compiled validators, built once at import time
+_QUESTIONS = TypeAdapter(list[Question])
+_FEEDBACK = TypeAdapter(Feedback)
+
+# Gemini Response Schemas
+# Passed as response_schema so decoding is constrained to strict JSON matching the models above
+
+# A batch of quiz questions, matching list[Question]
+QUESTION_SCHEMA = genai.protos.Schema(
+    type=genai.protos.Type.ARRAY,
+    items=genai.protos.Schema(
+        type=genai.protos.Type.OBJECT,
+        properties={
+            "question": genai.protos.Schema(type=genai.protos.Type.STRING),
+            "options": genai.protos.Schema(
+                type=genai.protos.Type.OBJECT,
+                properties={
+                    letter: genai.protos.Schema(type=genai.protos.Type.STRING)
+                    for letter in ["A", "B", "C", "D"]
+                },
+                required=["A", "B", "C", "D"]
+            ),
+            "correct_answer": genai.protos.Schema(
+                type=genai.protos.Type.STRING,
+                format="enum",
+                enum=["A", "B", "C", "D"]
+            ),
+            "explanation": genai.protos.Schema(type=genai.protos.Type.STRING)
+        },
+        required=["question", "options", "correct_answer", "explanation"]
+    )
+)
+
+QUESTION_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": QUESTION_SCHEMA
+}
+
+# Fields returned by Quick Check; the full schema adds the transcription and written feedback
+_FEEDBACK_QUICK_PROPERTIES = {
+    "score": genai.protos.Schema(type=genai.protos.Type.STRING),
+    "verdict": genai.protos.Schema(
+        type=genai.protos.Type.STRING,
+        format="enum",
+        enum=["Strict", "Lenient", "Correct"]
+    ),
+    "missing_keywords": genai.protos.Schema(
+        type=genai.protos.Type.ARRAY,
+        items=genai.protos.Schema(type=genai.protos.Type.STRING)
+    )
+}
+
+FEEDBACK_QUICK_SCHEMA = genai.protos.Schema(
+    type=genai.protos.Type.OBJECT,
+    properties=_FEEDBACK_QUICK_PROPERTIES,
+    required=["score", "verdict", "missing_keywords"]
+)
+
+FEEDBACK_SCHEMA = genai.protos.Schema(
+    type=genai.protos.Type.OBJECT,
+    properties={
+        "transcription": genai.protos.Schema(type=genai.protos.Type.STRING),
+        **_FEEDBACK_QUICK_PROPERTIES,
+        "feedback_text": genai.protos.Schema(type=genai.protos.Type.STRING),
+        "model_answer": genai.protos.Schema(type=genai.protos.Type.STRING)
+    },
+    required=["transcription", "score", "verdict", "missing_keywords", "feedback_text", "model_answer"]
+)
+
+FEEDBACK_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": FEEDBACK_SCHEMA
+}
+
+FEEDBACK_QUICK_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": FEEDBACK_QUICK_SCHEMA
+}
+
+# Gemini Prompts
+# Built once at import time; the quiz template is filled in with str.format
+_QUIZ_PROMPT_TMPL = """You are a PSLE Science tutor creating multiple-choice questions for Singapore Primary School students.
 
 Topic: {topic}
 Difficulty Level: {difficulty}
 
-Create a PSLE Science multiple-choice question with exactly 4 options (A, B, C, D).
-The question should be appropriate for Primary 5-6 students in Singapore.
-
-Respond in JSON format only:
-{{
-    "question": "The question text here",
-    "options": {{
-        "A": "Option A text",
-        "B": "Option B text",
-        "C": "Option C text",
-        "D": "Option D text"
-    }},
-    "correct_answer": "A",
-    "explanation": "A clear, educational explanation suitable for primary school students explaining why the answer is correct and why other options are wrong"
-}}
-
-Ensure the question tests understanding of key concepts in {topic} that are relevant to the PSLE Science syllabus."""
-        
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
-        
-        # Clean the response to extract JSON
-        # Remove markdown code blocks if present
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
-        
-        # Parse JSON
-        question_data = json.loads(response_text)
-        
-        return question_data
-        
-    except json.JSONDecodeError as e:
-        st.error(f"❌ Error parsing question response: {str(e)}")
-        st.error(f"Response received: {response_text[:500]}")
-        return None
-    except Exception as e:
-        st.error(f"❌ Error generating question: {str(e)}")
-        return None
+Generate {count} distinct PSLE Science multiple-choice questions, each with exactly 4 options (A, B, C, D).
+The questions should be appropriate for Primary 5-6 students in Singapore and should not repeat the same concept.
 
-def mark_worksheet(image):
-    """
-    Mark a student's worksheet using Gemini 2.5 Flash Vision
-    Returns feedback with marks, missing keywords, and corrections using strict PSLE marking standards
-    """
-    try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        prompt = """You are a strict, veteran Singapore PSLE Science Marker. Your job is not to be a friend, but to grade rigorously based on the MOE Syllabus.
+Respond in JSON format only, as a JSON array of {count} objects:
+[
+    {{
+        "question": "The question text here",
+        "options": {{
+            "A": "Option A text",
+            "B": "Option B text",
+            "C": "Option C text",
+            "D": "Option D text"
+        }},
+        "correct_answer": "A",
+        "explanation": "A clear, educational explanation suitable for primary school students explaining why the answer is correct and why other options are wrong"
+    }}
+]
+
+Ensure the questions test understanding of key concepts in {topic} that are relevant to the PSLE Science syllabus."""
+
+_MARK_RUBRIC = """You are a strict, veteran Singapore PSLE Science Marker. Your job is not to be a friend, but to grade rigorously based on the MOE Syllabus.
 
 **Your Marking Rubric:**
 1.  **Keyword Supremacy:** You must award ZERO marks if the student explains the concept correctly but misses the specific scientific keyword.
@@ -178,7 +274,9 @@ def mark_worksheet(image):
     * **E**vidence: Did they quote data from the table/graph?
     * **R**easoning: Did they link the evidence to the scientific concept?
     * *If any part is missing, deduct marks.*
+"""
 
+_MARK_PROMPT = _MARK_RUBRIC + """
 **Task:**
 Analyze the student's handwritten answer in the image.
 1.  Transcribe what they wrote.
@@ -197,23 +295,183 @@ Analyze the student's handwritten answer in the image.
 }
 
 Analyze the image carefully and provide your assessment."""
+
+# Quick Check asks only for the fields shown in the score summary, so far fewer tokens are generated
+_MARK_PROMPT_QUICK = _MARK_RUBRIC + """
+**Task:**
+Analyze the student's handwritten answer in the image.
+1.  Identify the missing keywords immediately.
+2.  Provide a strict score (e.g., 0/2, 1/2, or 2/2).
+Do not transcribe the answer, explain your marking, or write a model answer.
+
+**Output Format (JSON Only):**
+{
+    "score": "X/2",
+    "verdict": "Strict/Lenient/Correct",
+    "missing_keywords": ["List", "Of", "Missing", "Keywords"]
+}
+
+Analyze the image carefully and provide your assessment."""
+
+# Gemini Helper Functions
+def stream_response_text(model, contents, generation_config):
+    """
+    Stream a Gemini response and return the full text once the stream closes.
+    Progress is shown in a placeholder while chunks arrive; the partial JSON itself
+    is not rendered so quiz answers are not revealed early.
+    """
+    stream = model.generate_content(contents, generation_config=generation_config, stream=True)
+    
+    buf = []
+    received = 0
+    placeholder = st.empty()
+    for chunk in stream:
+        buf.append(chunk.text)
+        received += len(chunk.text)
+        placeholder.caption(f"⏳ Receiving response... ({received} characters)")
+    placeholder.empty()
+    
+    return "".join(buf)
+
+def generate_quiz_questions(topic, difficulty="Medium", count=None):
+    """
+    Generate a batch of PSLE Science MCQ questions using a single Gemini call
+    Returns a list of dictionaries with question, options, correct_answer, and explanation
+    """
+    if count is None:
+        count = QUIZ_BATCH_SIZE
+    
+    try:
+        model = get_model()
+        
+        prompt = _QUIZ_PROMPT_TMPL.format(topic=topic, difficulty=difficulty, count=count)
         
-        response = model.generate_content([prompt, image])
-        response_text = response.text.strip()
+        response_text = stream_response_text(model, prompt, QUESTION_GENERATION_CONFIG)
         
-        # Clean the response to extract JSON
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
+        # Parse and validate JSON in a single pass
+        questions = _QUESTIONS.validate_json(response_text)
         
-        # Parse JSON
-        feedback_data = json.loads(response_text)
+        return [question.model_dump() for question in questions]
+        
+    except ValidationError as e:
+        st.error(f"❌ Error parsing question response: {str(e)}")
+        st.error(f"Response received: {response_text[:500]}")
+        return []
+    except Exception as e:
+        st.error(f"❌ Error generating question: {str(e)}")
+        return []
+
+def fetch_quiz_questions(model, topic, difficulty, count):
+    """
+    Request a batch of quiz questions without touching the Streamlit UI
+    Safe to run on a background thread; raises on API or validation errors
+    """
+    prompt = _QUIZ_PROMPT_TMPL.format(topic=topic, difficulty=difficulty, count=count)
+    response = model.generate_content(prompt, generation_config=QUESTION_GENERATION_CONFIG)
+    
+    return [question.model_dump() for question in _QUESTIONS.validate_json(response.text)]
+
+def prefetch_quiz_questions(topic, difficulty="Medium"):
+    """
+    Start fetching the next question batch in the background once the buffer has run out
+    The pending Future is stored in st.session_state.prefetch_futures for generate_quiz_question
+    """
+    key = (topic, difficulty)
+    if st.session_state.question_buffer.get(key) or key in st.session_state.prefetch_futures:
+        return
+    
+    st.session_state.prefetch_futures[key] = get_prefetch_executor().submit(
+        fetch_quiz_questions, get_model(), topic, difficulty, QUIZ_BATCH_SIZE
+    )
+
+def generate_quiz_question(topic, difficulty="Medium"):
+    """
+    Return the next PSLE Science MCQ question for the topic and difficulty
+    Serves from st.session_state.question_buffer, then from a prefetched batch,
+    and only calls Gemini directly when neither is available
+    """
+    key = (topic, difficulty)
+    buffer = st.session_state.question_buffer.setdefault(key, [])
+    
+    if not buffer:
+        future = st.session_state.prefetch_futures.pop(key, None)
+        if future is not None:
+            try:
+                buffer.extend(future.result())
+            except Exception:
+                # Prefetch failed; fall back to a fresh request below
+                pass
+    
+    if not buffer:
+        buffer.extend(generate_quiz_questions(topic, difficulty))
+    
+    if not buffer:
+        return None
+    
+    return buffer.pop(0)
+
+def prepare_worksheet_image(image):
+    """
+    Downscale a worksheet image and re-encode it as JPEG for Gemini Vision
+    Returns an inline image part with the JPEG bytes, leaving the original image untouched
+    """
+    # Apply EXIF orientation first, since re-encoding drops the EXIF data
+    img = ImageOps.exif_transpose(image)
+    if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+        # JPEG has no alpha; flatten onto white so ink on a transparent background stays visible
+        rgba = img.convert("RGBA")
+        img = Image.new("RGB", rgba.size, "white")
+        img.paste(rgba, mask=rgba.getchannel("A"))
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+    img.thumbnail((WORKSHEET_MAX_EDGE, WORKSHEET_MAX_EDGE), Image.LANCZOS)
+    
+    # optimize=False skips the extra Huffman-table pass; the size saving is negligible after downscaling
+    with io.BytesIO() as buf:
+        img.save(buf, "JPEG", quality=WORKSHEET_JPEG_QUALITY, optimize=False)
+        payload = buf.getvalue()
+    
+    return {"mime_type": "image/jpeg", "data": payload}
+
+@st.cache_data(show_spinner=False, max_entries=WORKSHEET_CACHE_MAX_ENTRIES, ttl=WORKSHEET_CACHE_TTL)
+def load_worksheet_image(file_bytes):
+    """
+    Decode an uploaded worksheet and return the prepared JPEG image part
+    The decoded full-resolution image is closed as soon as the JPEG has been encoded
+    """
+    with Image.open(io.BytesIO(file_bytes)) as img:
+        img.load()
+        return prepare_worksheet_image(img)
+
+def worksheet_image_key(image_part):
+    """
+    Return a content hash identifying a prepared worksheet image
+    """
+    return hashlib.blake2b(image_part["data"], digest_size=16).hexdigest()
+
+def mark_worksheet(image, quick=False):
+    """
+    Mark a student's worksheet using Gemini 2.5 Flash Vision
+    Accepts a PIL image or an inline image part from prepare_worksheet_image
+    Returns feedback with marks, missing keywords, and corrections using strict PSLE marking standards
+    With quick=True only the score, verdict, and missing keywords are requested
+    """
+    try:
+        model = get_model()
+        if quick:
+            prompt, generation_config = _MARK_PROMPT_QUICK, FEEDBACK_QUICK_GENERATION_CONFIG
+        else:
+            prompt, generation_config = _MARK_PROMPT, FEEDBACK_GENERATION_CONFIG
+        
+        response_text = stream_response_text(model, [prompt, image], generation_config)
+        
+        # Parse and validate JSON in a single pass
+        feedback_data = _FEEDBACK.validate_json(response_text).model_dump()
         
         return feedback_data
         
-    except json.JSONDecodeError as e:
-        # If JSON parsing fails, return a structured error response
+    except ValidationError as e:
+        # If JSON parsing or validation fails, return a structured error response
         return {
             "error": True,
             "raw_response": response_text,
@@ -225,6 +483,53 @@ Analyze the image carefully and provide your assessment."""
             "message": f"Error marking worksheet: {str(e)}"
         }
 
+class MarkingError(Exception):
+    """Raised inside the marking cache so failed marks are returned but never cached."""
+    def __init__(self, feedback):
+        super().__init__(feedback.get('message', 'Error marking worksheet'))
+        self.feedback = feedback
+
+@st.cache_data(show_spinner=False, max_entries=WORKSHEET_CACHE_MAX_ENTRIES, ttl=WORKSHEET_CACHE_TTL)
+def _mark_worksheet_cached(image_key, quick, _image_part):
+    """
+    Memoized mark_worksheet keyed on the image hash and marking mode.
+    The image part itself is excluded from Streamlit's argument hashing (leading underscore).
+    """
+    feedback = mark_worksheet(_image_part, quick=quick)
+    if feedback.get('error'):
+        raise MarkingError(feedback)
+    return feedback
+
+def mark_worksheet_cached(image_part, quick=False):
+    """
+    Mark a prepared worksheet image, reusing the previous result for identical uploads
+    """
+    image_key = worksheet_image_key(image_part)
+    try:
+        return _mark_worksheet_cached(image_key, quick, image_part)
+    except MarkingError as e:
+        return e.feedback
+
+def build_topic_df(topic_counts):
+    """
+    Build the Dashboard's per-topic performance table from (topic, count) pairs
+    """
+    import pandas as pd
+    
+    # Calculate accuracy (simplified - in real app, track correct/incorrect per question)
+    df_data = []
+    for topic, total in topic_counts:
+        # For demo purposes, estimate accuracy based on score
+        # In production, you'd track this properly
+        accuracy = 75 if total > 0 else 0  # Dummy data
+        df_data.append({
+            'Topic': topic,
+            'Questions Attempted': total,
+            'Estimated Accuracy (%)': accuracy
+        })
+    
+    return pd.DataFrame(df_data)
+
 # UI Components
 def main():
     # Header
@@ -266,12 +571,17 @@ def main():
                 with st.spinner("🧠 Creating a perfect question for you..."):
                     question_data = generate_quiz_question(topic, difficulty)
                     if question_data:
+                        # Precompute the answer choices once so reruns don't rebuild them
+                        options = question_data.get('options', {})
+                        question_data['_keys'] = list(options)
+                        question_data['_labels'] = [f"{k}. {v}" for k, v in options.items()]
                         st.session_state.current_question = question_data
                         st.session_state.quiz_history.append({
                             "topic": topic,
                             "difficulty": difficulty,
                             "question": question_data.get("question", "")
                         })
+                        st.session_state.topic_counter[topic] += 1
         
         with col2:
             st.metric("📈 Current Score", f"{st.session_state.quiz_score} points")
@@ -288,13 +598,13 @@ def main():
             st.markdown(f"**{question_data.get('question', 'No question generated')}**")
             
             # Options as Radio Buttons
-            options = question_data.get('options', {})
-            user_answer = st.radio(
+            answer_labels = question_data['_labels']
+            selected_label = st.radio(
                 "Select your answer:",
-                options=list(options.keys()),
-                format_func=lambda x: f"{x}. {options[x]}",
+                options=answer_labels,
                 key="user_answer_radio"
             )
+            user_answer = question_data['_keys'][answer_labels.index(selected_label)] if selected_label is not None else None
             
             # Check Answer Button
             col_check1, col_check2 = st.columns([1, 4])
@@ -315,6 +625,9 @@ def main():
                 else:
                     st.error(f"❌ **Incorrect.** The correct answer is **{correct_answer}**.")
                     st.warning(f"💡 **Explanation:** {explanation}")
+                
+                # Fetch the next batch while the student reads the explanation
+                prefetch_quiz_questions(topic, difficulty)
         
         else:
             st.info("👆 Click 'Generate New Question' to start practicing!")
@@ -339,8 +652,9 @@ def main():
                 
                 # Handle different file types
                 if uploaded_file.type.startswith('image/'):
-                    image = Image.open(uploaded_file)
-                    st.image(image, caption="Uploaded Worksheet", use_container_width=True)
+                    # Preview the downscaled JPEG; the full-resolution decode is released inside the loader
+                    image = load_worksheet_image(uploaded_file.getvalue())
+                    st.image(image["data"], caption="Uploaded Worksheet", use_container_width=True)
                 elif uploaded_file.type == 'application/pdf':
                     st.warning("📄 PDF detected. Please convert to PNG/JPG for best results, or upload an image file.")
                     st.info("For now, extracting first page as image...")
@@ -353,9 +667,16 @@ def main():
                 
                 # Mark Button
                 if image is not None:
+                    marking_mode = st.radio(
+                        "Marking Mode:",
+                        ["Quick Check", "Full Feedback"],
+                        index=1,
+                        horizontal=True,
+                        help="Quick Check returns only the score and missing keywords, and is much faster"
+                    )
                     if st.button("🔍 Mark My Worksheet", type="primary", use_container_width=True):
                         with st.spinner("👨‍🏫 Marking your worksheet... Please wait..."):
-                            feedback = mark_worksheet(image)
+                            feedback = mark_worksheet_cached(image, quick=marking_mode == "Quick Check")
                             
                             # Store feedback in session state
                             st.session_state.worksheet_feedback = feedback
@@ -431,6 +752,8 @@ def main():
     
     # Mode 3: Student Dashboard
     elif mode == "Student Dashboard":
+        import pandas as pd
+        
         st.header("📊 Student Dashboard")
         st.markdown("Track your progress and performance!")
         
@@ -445,7 +768,7 @@ def main():
         with col3:
             st.metric("🏆 Score", f"{st.session_state.quiz_score} points")
         with col4:
-            st.metric("📚 Topics Covered", len(set([q.get('topic', '') for q in st.session_state.quiz_history])))
+            st.metric("📚 Topics Covered", len(st.session_state.topic_counter))
         
         st.markdown("---")
         
@@ -453,54 +776,23 @@ def main():
         if st.session_state.quiz_history:
             st.subheader("📈 Performance by Topic")
             
-            # Create performance data
-            topic_stats = {}
-            for item in st.session_state.quiz_history:
-                topic = item.get('topic', 'Unknown')
-                if topic not in topic_stats:
-                    topic_stats[topic] = {'total': 0, 'correct': 0}
-                topic_stats[topic]['total'] += 1
-            
-            # Calculate accuracy (simplified - in real app, track correct/incorrect per question)
-            df_data = []
-            for topic, stats in topic_stats.items():
-                # For demo purposes, estimate accuracy based on score
-                # In production, you'd track this properly
-                accuracy = 75 if stats['total'] > 0 else 0  # Dummy data
-                df_data.append({
-                    'Topic': topic,
-                    'Questions Attempted': stats['total'],
-                    'Estimated Accuracy (%)': accuracy
-                })
-            
-            df = pd.DataFrame(df_data)
+            # Build the chart data from the per-topic counter maintained at quiz time
+            df = build_topic_df(sorted(st.session_state.topic_counter.items()))
             
-            # Create bar chart
+            # Create bar chart (rendered with Streamlit's bundled Vega-Lite, no Plotly needed)
             if not df.empty:
-                fig = px.bar(
-                    df,
-                    x='Topic',
-                    y='Estimated Accuracy (%)',
-                    title='Your Performance by Topic',
-                    color='Estimated Accuracy (%)',
-                    color_continuous_scale='Greens',
-                    text='Estimated Accuracy (%)'
-                )
-                fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-                fig.update_layout(
-                    xaxis_title="Science Topic",
-                    yaxis_title="Accuracy (%)",
-                    height=400
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                st.bar_chart(df, x='Topic', y='Estimated Accuracy (%)', height=400)
         else:
             st.info("📊 No data yet! Complete some quizzes to see your performance here.")
         
         # Quiz History
         if st.session_state.quiz_history:
             st.subheader("📜 Recent Quiz History")
-            history_df = pd.DataFrame(st.session_state.quiz_history[-10:])  # Show last 10
-            st.dataframe(history_df, use_container_width=True, hide_index=True)
+            # Only rebuild the table when new questions have been added since the last render
+            if st.session_state.history_df is None or st.session_state.history_df_len != len(st.session_state.quiz_history):
+                st.session_state.history_df = pd.DataFrame(st.session_state.quiz_history[-10:])  # Show last 10
+                st.session_state.history_df_len = len(st.session_state.quiz_history)
+            st.dataframe(st.session_state.history_df, use_container_width=True, hide_index=True)
         else:
             st.info("📜 Your quiz history will appear here after you complete some questions!")
 
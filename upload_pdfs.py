@@ -4,11 +4,16 @@ Script to upload PSLE Science PDFs to Gemini API for caching.
 This script:
 1. Loads API key from .env file
 2. Finds all PDF files in the 'pdfs' folder
-3. Uploads each PDF to Gemini API
+3. Uploads each new or changed PDF to Gemini API (several at a time),
+   skipping files whose content hash is already in the manifest (uploaded.json)
 4. Prints the file URIs (file.name) for use in the main app
+5. Writes the URIs to the manifest
 """
 
+import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from dotenv import load_dotenv
 import google.generativeai as genai
@@ -24,6 +29,13 @@ if not api_key:
 
 genai.configure(api_key=api_key)
 
+# Number of PDFs uploaded concurrently (uploads are network-bound)
+MAX_UPLOAD_WORKERS = 8
+
+# Manifest of uploaded files (content hash -> filenames and URI), used to skip unchanged PDFs
+MANIFEST_PATH = Path('uploaded.json')
+HASH_CHUNK_SIZE = 1 << 20  # 1MB
+
 # Find PDFs folder
 pdfs_folder = Path('pdfs')
 
@@ -47,34 +59,127 @@ print(f"📚 Found {len(pdf_files)} PDF file(s) to upload:\n")
 for pdf_file in pdf_files:
     print(f"   - {pdf_file.name}")
 
+# Load the manifest of earlier uploads, keyed on each PDF's content hash
+manifest = {}
+if MANIFEST_PATH.exists():
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"\n⚠️  Warning: Could not read {MANIFEST_PATH}, starting a new manifest: {str(e)}")
+
 print("\n" + "="*60)
 print("🚀 Starting upload process...\n")
 
-# Upload files and collect URIs
+def file_digest(pdf_file):
+    """Return the blake2b hex digest of a file, read in 1MB chunks."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(pdf_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def upload_one(pdf_file, digest):
+    """Upload a single PDF to Gemini API unless the manifest already has it; return (uri, reused)."""
+    # Reuse the earlier upload if it is still available (uploaded files expire after a while)
+    cached = manifest.get(digest)
+    if cached:
+        try:
+            genai.get_file(cached['uri'])
+            return cached['uri'], True
+        except Exception:
+            pass
+    
+    uploaded_file = genai.upload_file(
+        path=str(pdf_file),
+        mime_type='application/pdf',
+        display_name=pdf_file.name
+    )
+    return uploaded_file.name, False
+
+# Hash every PDF first and group files with identical content, so each is uploaded once
 uploaded_files = []
 failed_files = []
+reused_count = 0
 
+files_by_digest = {}
 for pdf_file in pdf_files:
     try:
-        print(f"📤 Uploading: {pdf_file.name}...")
-        
-        # Upload file to Gemini API
-        uploaded_file = genai.upload_file(path=str(pdfs_folder / pdf_file.name))
-        
-        uploaded_files.append({
-            'filename': pdf_file.name,
-            'uri': uploaded_file.name
-        })
-        
-        print(f"   ✅ Success! URI: {uploaded_file.name}\n")
-        
-    except Exception as e:
-        print(f"   ❌ Error uploading {pdf_file.name}: {str(e)}\n")
+        files_by_digest.setdefault(file_digest(pdf_file), []).append(pdf_file)
+    except OSError as e:
+        print(f"   ❌ Error reading {pdf_file.name}: {str(e)}")
         failed_files.append(pdf_file.name)
 
+# Prune manifest entries for filenames whose content has changed since they were uploaded
+current_digests = {
+    pdf_file.name: digest
+    for digest, group in files_by_digest.items()
+    for pdf_file in group
+}
+manifest_changed = False
+for digest in list(manifest):
+    filenames = manifest[digest]['filenames']
+    kept = [name for name in filenames if current_digests.get(name, digest) == digest]
+    if len(kept) != len(filenames):
+        manifest_changed = True
+        if kept:
+            manifest[digest]['filenames'] = kept
+        else:
+            del manifest[digest]
+
+with ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS) as executor:
+    futures = {}
+    for digest, group in files_by_digest.items():
+        names = ", ".join(pdf_file.name for pdf_file in group)
+        if digest in manifest:
+            print(f"🔎 Checking earlier upload: {names}...")
+        else:
+            print(f"📤 Uploading: {names}...")
+        futures[executor.submit(upload_one, group[0], digest)] = (digest, group)
+    print()
+    
+    for future in as_completed(futures):
+        digest, group = futures[future]
+        filenames = [pdf_file.name for pdf_file in group]
+        try:
+            uri, reused = future.result()
+            
+            for filename in filenames:
+                uploaded_files.append({
+                    'filename': filename,
+                    'uri': uri
+                })
+            
+            previous = manifest.get(digest, {})
+            manifest[digest] = {
+                'filenames': sorted(set(previous.get('filenames', [])) | set(filenames)),
+                'uri': uri
+            }
+            manifest_changed = True
+            
+            if reused:
+                reused_count += len(filenames)
+                print(f"   ♻️  {', '.join(filenames)} unchanged, reusing URI: {uri}\n")
+            else:
+                print(f"   ✅ {', '.join(filenames)} uploaded! URI: {uri}\n")
+            
+        except Exception as e:
+            print(f"   ❌ Error uploading {', '.join(filenames)}: {str(e)}\n")
+            failed_files.extend(filenames)
+
+# Uploads finish in any order; sort the summary by filename
+uploaded_files.sort(key=lambda item: item['filename'])
+failed_files.sort()
+
+if manifest_changed:
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
 print("="*60)
 print("\n📋 UPLOAD SUMMARY\n")
-print(f"✅ Successfully uploaded: {len(uploaded_files)} file(s)")
+print(f"✅ Successfully uploaded: {len(uploaded_files) - reused_count} file(s)")
+if reused_count:
+    print(f"♻️  Unchanged (already uploaded): {reused_count} file(s)")
 if failed_files:
     print(f"❌ Failed to upload: {len(failed_files)} file(s)")
 
@@ -89,6 +194,9 @@ if uploaded_files:
 else:
     print("No files were successfully uploaded.")
 
+if manifest_changed:
+    print(f"🗂️  URIs saved to: {MANIFEST_PATH.absolute()}\n")
+
 print("="*60)
 print("\n💡 To use these files in your app, reference them by their URI (file.name)")
 print("   Example: file = genai.get_file('the-uri-here')")